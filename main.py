@@ -1,10 +1,8 @@
 """
 Main entry point for the robot gold collection simulation
 """
-import random
-
 from grid import Grid
-from robot import Robot
+from robot import create_group
 from simulation import Simulation
 
 
@@ -12,24 +10,9 @@ def main():
     # Initialize grid
     grid = Grid(size=20, num_gold=10)
     
-    # Initialize robots
-    group1 = []
-    group2 = []
-    
-    for i in range(10):
-        # Group 1 robots start near top-left
-        x = random.randint(0, 4)
-        y = random.randint(0, 4)
-        direction = random.choice(['N', 'S', 'E', 'W'])
-        robot = Robot(i, 1, (x, y), direction)
-        group1.append(robot)
-        
-        # Group 2 robots start near bottom-right
-        x = random.randint(15, 19)
-        y = random.randint(15, 19)
-        direction = random.choice(['N', 'S', 'E', 'W'])
-        robot = Robot(i + 10, 2, (x, y), direction)
-        group2.append(robot)
+    # Initialize robots: group 1 near top-left, group 2 near bottom-right
+    group1 = create_group(1, 10, start_id=0, low=0, high=4)
+    group2 = create_group(2, 10, start_id=10, low=15, high=19)
     
     # Run simulation
     sim = Simulation(grid, group1, group2, steps=5000)
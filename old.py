@@ -1,24 +1,14 @@
 import random
 import time
 import numpy as np
-from enum import Enum
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 from collections import defaultdict
 
-def strip_ansi(text):
-    """Remove ANSI escape codes from text"""
-    import re
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
+from grid import Grid
+from utils import strip_ansi
 
-class Direction(Enum):
-    NORTH = (0, -1)
-    SOUTH = (0, 1)
-    EAST = (1, 0)
-    WEST = (-1, 0)
-
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PaxosMessage:
     """Message for Paxos consensus protocol"""
     msg_type: str  # 'prepare', 'promise', 'accept', 'accepted'
@@ -28,38 +18,6 @@ class PaxosMessage:
     accepted_id: Optional[int] = None
     accepted_value: Optional[Any] = None
 
-class Grid:
-    def __init__(self, size=20, num_gold=30):
-        self.size = size
-        self.grid = np.zeros((size, size), dtype=int)
-        self._place_deposits()
-        self._place_gold(num_gold)
-        self.num_gold = np.count_nonzero(self.grid == 1)
-
-    def _place_deposits(self):
-        # Fixed deposits: top-left for group 1, bottom-right for group 2
-        self.grid[0, 0] = 2  # Group 1 deposit
-        self.grid[self.size-1, self.size-1] = 3  # Group 2 deposit
-
-    def _place_gold(self, num_gold):
-        for _ in range(num_gold):
-            while True:
-                x, y = random.randint(0, self.size-1), random.randint(0, self.size-1)
-                if self.grid[x, y] == 0:  # Place gold only on empty cells
-                    self.grid[x, y] = 1
-                    break
-                    
-    def get_cell(self, pos):
-        x, y = pos
-        if 0 <= x < self.size and 0 <= y < self.size:
-            return self.grid[x, y]
-        return -1
-
-    def update_cell(self, pos, value):
-        x, y = pos
-        if 0 <= x < self.size and 0 <= y < self.size:
-            self.grid[x, y] = value
-
 class Robot:
     def __init__(self, robot_id: int, group: int, position: Tuple[int, int], direction: str, grid_size: int = 20):
         self.id = robot_id
@@ -1,19 +1,71 @@
 """
 Robot class implementing the Finder-Helper protocol
 """
+import functools
 import random
 from typing import List, Tuple, Optional, Dict, Any
 
+import numpy as np
+
+from utils import Action, DIRECTION_VECTORS, Message
+
+# Shared generator for start poses; create_group accepts its own for reproducible runs
+_RNG = np.random.default_rng()
+
+# Facing after a 90 degree turn
+_TURN_LEFT = {'N': 'W', 'W': 'S', 'S': 'E', 'E': 'N'}
+_TURN_RIGHT = {'N': 'E', 'E': 'S', 'S': 'W', 'W': 'N'}
+
+
+@functools.lru_cache(maxsize=None)
+def _visible_positions(position: Tuple[int, int], direction: str, grid_size: int) -> Tuple[Tuple[int, int], ...]:
+    """Calculate visible positions for a pose (cached: depends only on its arguments)"""
+    visible = []
+    x, y = position
+
+    dx, dy = DIRECTION_VECTORS[direction]
+
+    if direction in ['N', 'S']:
+        perp = [(0, 1), (0, -1)]  # right, left
+    else:
+        perp = [(1, 0), (-1, 0)]  # down, up
+        
+    # Front row
+    front_x, front_y = x + dx, y + dy
+    for offset_dx, offset_dy in [(-perp[0][0], -perp[0][1]), (0, 0), perp[0]]:
+        px, py = front_x + offset_dx, front_y + offset_dy
+        if 0 <= px < grid_size and 0 <= py < grid_size:
+            visible.append((px, py))
+            
+    # Second row
+    front2_x, front2_y = front_x + dx, front_y + dy
+    for i in range(-2, 3):
+        px, py = front2_x + i * perp[0][0], front2_y + i * perp[0][1]
+        if 0 <= px < grid_size and 0 <= py < grid_size:
+            visible.append((px, py))
+    return tuple(visible)
+
+
 # Messages: found, response, ack, here, ack2
 
 
 class Robot:
+    __slots__ = (
+        'id', 'group', 'position', 'direction', 'grid_size', 'deposit_pos',
+        'state', 'holding_gold', 'carrying_with', 'target_gold_pos', 'next_action',
+        'role', 'message_index', 'finder_id', 'helper_id', 'current_message_index',
+        'timeout_counter', 'max_timeout', 'wait_timer', 'pickup_timer',
+        'message_inbox', 'message_outbox', 'observed_gold', 'teammate_states',
+    )
+
     def __init__(self, robot_id: int, group: int, position: Tuple[int, int], direction: str, grid_size: int = 20):
         self.id = robot_id
         self.group = group
         self.position = position  # (x, y)
         self.direction = direction  # 'N', 'S', 'E', 'W'
         self.grid_size = grid_size
+        # Deposit for this robot's group, fixed for the whole run
+        self.deposit_pos = (0, 0) if group == 1 else (grid_size - 1, grid_size - 1)
         
         # State machine states: 
         # "exploring" -> searching for gold
@@ -32,7 +84,7 @@ class Robot:
         self.holding_gold = False
         self.carrying_with: Optional[int] = None
         self.target_gold_pos: Optional[Tuple[int, int]] = None
-        self.next_action: Optional[str] = None
+        self.next_action: Optional[Action] = None
         
         # Finder-Helper Protocol State
         self.role = 'exploring'  # 'exploring', 'finder', 'helper'
@@ -48,8 +100,8 @@ class Robot:
         self.pickup_timer = 0
 
         # Communication
-        self.message_inbox: List[Dict] = []
-        self.message_outbox: List[Dict] = []
+        self.message_inbox: List[Message] = []
+        self.message_outbox: List[Message] = []
         
         # Observations
         self.observed_gold: List[Tuple[int, int]] = []
@@ -57,36 +109,11 @@ class Robot:
         
     def get_deposit_pos(self):
         """Get deposit position for this robot's group"""
-        return (0, 0) if self.group == 1 else (self.grid_size - 1, self.grid_size - 1)
+        return self.deposit_pos
     
-    def get_visible_positions(self) -> List[Tuple[int, int]]:
+    def get_visible_positions(self) -> Tuple[Tuple[int, int], ...]:
         """Calculate visible positions based on direction"""
-        visible = []
-        x, y = self.position
-
-        # N: up (row-1), S: down (row+1), E: right (col+1), W: left (col-1)
-        dir_map = {'N': (-1, 0), 'S': (1, 0), 'E': (0, 1), 'W': (0, -1)}
-        dx, dy = dir_map[self.direction]
-
-        if self.direction in ['N', 'S']:
-            perp = [(0, 1), (0, -1)]  # right, left
-        else:
-            perp = [(1, 0), (-1, 0)]  # down, up
-            
-        # Front row
-        front_x, front_y = x + dx, y + dy
-        for offset_dx, offset_dy in [(-perp[0][0], -perp[0][1]), (0, 0), perp[0]]:
-            pos = (front_x + offset_dx, front_y + offset_dy)
-            if self._is_valid_pos(pos):
-                visible.append(pos)
-                
-        # Second row
-        front2_x, front2_y = front_x + dx, front_y + dy
-        for i in range(-2, 3):
-            pos = (front2_x + i * perp[0][0], front2_y + i * perp[0][1])
-            if self._is_valid_pos(pos):
-                visible.append(pos)
-        return visible
+        return _visible_positions(self.position, self.direction, self.grid_size)
 
     def observe(self, visible_cells: Dict[Tuple[int, int], int]):
         """Observe visible positions based on direction (3 front + 5 further)"""
@@ -105,13 +132,11 @@ class Robot:
     def process_messages(self):
         """Process incoming messages using finder-helper protocol"""
         for msg in self.message_inbox:
-            msg_type = msg.get("type")
-            sender_id = msg.get("sender_id")
-            content = msg.get("content", {})
+            msg_type = msg.type
+            content = msg.content
 
             if msg_type == "state_update":
-                teammate_id = msg["sender_id"]
-                self.teammate_states[teammate_id] = msg["content"]
+                self.teammate_states[msg.sender_id] = content
 
             # FINDER-HELPER PROTOCOL MESSAGES
             elif msg_type == "found":
@@ -123,16 +148,16 @@ class Robot:
                     finder_pos = tuple(content.get("finder_pos"))
                     
                     # Send response to offer help
-                    self.message_outbox.append({
-                        "type": "response",
-                        "sender_id": self.id,
-                        "recipient_id": finder_id,
-                        "content": {
+                    self.message_outbox.append(Message(
+                        type="response",
+                        sender_id=self.id,
+                        recipient_id=finder_id,
+                        content={
                             "helper_id": self.id,
                             "finder_id": finder_id,
                             "index": msg_index
                         }
-                    })
+                    ))
                     self.state = "helper_waiting_ack"
                     self.role = 'helper'
                     self.finder_id = finder_id
@@ -149,16 +174,16 @@ class Robot:
                         # Accept first response
                         self.helper_id = helper_id
                         self.carrying_with = helper_id
-                        self.message_outbox.append({
-                            "type": "ack",
-                            "sender_id": self.id,
-                            "recipient_id": helper_id,
-                            "content": {
+                        self.message_outbox.append(Message(
+                            type="ack",
+                            sender_id=self.id,
+                            recipient_id=helper_id,
+                            content={
                                 "finder_id": self.id,
                                 "helper_id": helper_id,
                                 "index": msg_index
                             }
-                        })
+                        ))
                         self.state = "finder_waiting_here"
                         self.timeout_counter = 0
 
@@ -202,7 +227,7 @@ class Robot:
         
         self.message_inbox.clear()
     
-    def decide_action(self, visible_cells: Dict[Tuple[int, int], int]) -> str:
+    def decide_action(self, visible_cells: Dict[Tuple[int, int], int]) -> Action:
         """Main decision logic based on finder-helper protocol state machine"""
         
         # CARRYING GOLD - move to deposit
@@ -213,7 +238,7 @@ class Robot:
                 # The simulation's _execute_actions will handle checking if both robots are physically present
                 self.state = "at_deposit"
                 self.wait_timer = 0
-                return "idle"
+                return Action.IDLE
             
             return self._get_move_action_towards(deposit)
         
@@ -221,16 +246,16 @@ class Robot:
         if self.state == "at_deposit":
             if not self.holding_gold:
             # Deposit succeeded or gold was dropped by simulation
-                return "idle"
+                return Action.IDLE
             
             # Timeout after waiting too long at deposit
             self.wait_timer += 1
             if self.wait_timer > 20:
                 print(f"DEBUG: R{self.id} timed out at deposit (partner didn't arrive), resetting")
                 self._reset_to_exploring()
-                return "idle"
+                return Action.IDLE
             
-            return "idle"
+            return Action.IDLE
         
         # READY TO PICKUP - execute pickup
         if self.state == "ready_to_pickup":
@@ -238,16 +263,16 @@ class Robot:
             if self.holding_gold:
                 self.state = "carrying_gold"
                 self.pickup_timer = 0
-                return "idle"
+                return Action.IDLE
             
             # Timeout if stuck 
             self.pickup_timer += 1
             if self.pickup_timer > 5:
                 print(f"DEBUG: R{self.id} timed out in ready_to_pickup (likely crowding), resetting")
                 self._reset_to_exploring()
-                return "idle"
+                return Action.IDLE
             
-            return "pickup"
+            return Action.PICKUP
         
         # WAITING AT GOLD - wait for partner to arrive
         if self.state == "waiting_at_gold":
@@ -260,13 +285,13 @@ class Robot:
                     partner_state.get("state") in ["waiting_at_gold", "ready_to_pickup"]):
                     self.state = "ready_to_pickup"
                     self.pickup_timer = 0  # Reset timer when entering this state
-                    return "idle"
+                    return Action.IDLE
 
             # Check if gold still exists (using local sensing)
             if self.position in visible_cells:
                  if not visible_cells[self.position] > 0:
                      self._reset_to_exploring()
-                     return "idle"
+                     return Action.IDLE
             
             # Timeout after waiting too long
             self.wait_timer += 1
@@ -274,23 +299,23 @@ class Robot:
                 print(f"DEBUG: R{self.id} timed out waiting at gold, resetting")
                 self._reset_to_exploring()
                 self.wait_timer = 0
-                return "idle"
+                return Action.IDLE
             
-            return "idle"
+            return Action.IDLE
         
         # MOVING TO GOLD - navigate to gold position
         if self.state == "moving_to_gold" and self.target_gold_pos:
             if self.position == self.target_gold_pos:
                 self.state = "waiting_at_gold"
                 self.wait_timer = 0  # Reset timer when arriving
-                return "idle"
+                return Action.IDLE
             
             # Check if gold is missing (only if visible)
             if self.target_gold_pos in visible_cells:
                 if not visible_cells[self.target_gold_pos] > 0:
                     # Gold gone, reset
                     self._reset_to_exploring()
-                    return "idle"
+                    return Action.IDLE
             
             return self._get_move_action_towards(self.target_gold_pos)
         
@@ -302,7 +327,7 @@ class Robot:
                 # Retry sending found message
                 self._send_found_message()
                 self.timeout_counter = 0
-            return "idle"
+            return Action.IDLE
         
         if self.state == "finder_waiting_here":
             # Wait for helper to reach opposite position
@@ -310,39 +335,39 @@ class Robot:
             if self.timeout_counter > self.max_timeout:
                 # Timeout, reset
                 self._reset_to_exploring()
-            return "idle"
+            return Action.IDLE
         
         if self.state == "finder_ready":
             # Move to gold and send ack2
             if self.position == self.target_gold_pos:
                 # Already at gold, send ack2
-                self.message_outbox.append({
-                    "type": "ack2",
-                    "sender_id": self.id,
-                    "recipient_id": self.helper_id,
-                    "content": {
+                self.message_outbox.append(Message(
+                    type="ack2",
+                    sender_id=self.id,
+                    recipient_id=self.helper_id,
+                    content={
                         "finder_id": self.id,
                         "helper_id": self.helper_id,
                         "index": self.current_message_index
                     }
-                })
+                ))
                 self.state = "moving_to_gold"  # Will transition to waiting_at_gold
-                return "idle"
+                return Action.IDLE
             else:
                 # Move to gold
                 action = self._get_move_action_towards(self.target_gold_pos)
                 # Once we start moving, send ack2
-                if action == "move":
-                    self.message_outbox.append({
-                        "type": "ack2",
-                        "sender_id": self.id,
-                        "recipient_id": self.helper_id,
-                        "content": {
+                if action == Action.MOVE:
+                    self.message_outbox.append(Message(
+                        type="ack2",
+                        sender_id=self.id,
+                        recipient_id=self.helper_id,
+                        content={
                             "finder_id": self.id,
                             "helper_id": self.helper_id,
                             "index": self.current_message_index
                         }
-                    })
+                    ))
                     self.state = "moving_to_gold"
                 return action
         
@@ -353,7 +378,7 @@ class Robot:
             if self.timeout_counter > self.max_timeout:
                 # Not selected, go back to exploring
                 self._reset_to_exploring()
-            return "idle"
+            return Action.IDLE
         
         if self.state == "helper_moving_opposite":
             # Calculate opposite position
@@ -362,22 +387,22 @@ class Robot:
                 
                 if self.position == opposite_pos:
                     # Reached opposite, send here message
-                    self.message_outbox.append({
-                        "type": "here",
-                        "sender_id": self.id,
-                        "recipient_id": self.finder_id,
-                        "content": {
+                    self.message_outbox.append(Message(
+                        type="here",
+                        sender_id=self.id,
+                        recipient_id=self.finder_id,
+                        content={
                             "helper_id": self.id,
                             "finder_id": self.finder_id,
                             "index": self.current_message_index
                         }
-                    })
+                    ))
                     self.state = "helper_waiting_ack2"
                     self.timeout_counter = 0
-                    return "idle"
+                    return Action.IDLE
                 
                 return self._get_move_action_towards(opposite_pos)
-            return "idle"
+            return Action.IDLE
         
         if self.state == "helper_waiting_ack2":
             # Wait for ack2 from finder
@@ -385,7 +410,7 @@ class Robot:
             if self.timeout_counter > self.max_timeout:
                 # Timeout, reset
                 self._reset_to_exploring()
-            return "idle"
+            return Action.IDLE
         
         # EXPLORING STATE - look for gold
         if self.state == "exploring":
@@ -399,28 +424,28 @@ class Robot:
                 self._send_found_message()
                 self.state = "finder_waiting_response"
                 self.timeout_counter = 0
-                return "idle"
+                return Action.IDLE
             
             # Random exploration
             if random.random() < 0.2:
-                return random.choice(["turn_left", "turn_right"])
-            return "move"
+                return random.choice([Action.TURN_LEFT, Action.TURN_RIGHT])
+            return Action.MOVE
         
-        return "idle"
+        return Action.IDLE
     
     def _send_found_message(self):
         """Send found message to all teammates"""
-        self.message_outbox.append({
-            "type": "found",
-            "sender_id": self.id,
-            "broadcast": True,
-            "content": {
+        self.message_outbox.append(Message(
+            type="found",
+            sender_id=self.id,
+            broadcast=True,
+            content={
                 "finder_id": self.id,
                 "index": self.current_message_index,
                 "gold_pos": self.target_gold_pos,
                 "finder_pos": self.position
             }
-        })
+        ))
     
     def _get_opposite_position(self, gold_pos: Tuple[int, int]) -> Tuple[int, int]:
         """Calculate opposite position across gold from finder"""
@@ -447,7 +472,7 @@ class Robot:
         self.wait_timer = 0
         self.pickup_timer = 0
     
-    def _get_move_action_towards(self, target: Tuple[int, int]) -> str:
+    def _get_move_action_towards(self, target: Tuple[int, int]) -> Action:
         """Get action to move towards target"""
         dx = target[0] - self.position[0]
         dy = target[1] - self.position[1]
@@ -461,11 +486,11 @@ class Robot:
         
         if self.direction != desired:
             if self._should_turn_left(desired):
-                return "turn_left"
+                return Action.TURN_LEFT
             else:
-                return "turn_right"
+                return Action.TURN_RIGHT
         
-        return "move"
+        return Action.MOVE
     
     def _should_turn_left(self, target_dir: str) -> bool:
         """Determine if should turn left"""
@@ -478,25 +503,34 @@ class Robot:
         
         return left_turns <= right_turns
     
-    def execute_action(self, action: str):
+    def execute_action(self, action: Action):
         """Execute the decided action"""
-        if action == "move":
-            # Move according to (row, col) convention
-            dir_map = {'N': (-1, 0), 'S': (1, 0), 'E': (0, 1), 'W': (0, -1)}
-            dx, dy = dir_map[self.direction]
-            new_pos = (self.position[0] + dx, self.position[1] + dy)
-            if self._is_valid_pos(new_pos):
-                if self.holding_gold and self.carrying_with:
-                    pass
-                self.position = new_pos
-        elif action == "turn_left":
-            dirs = ['N', 'W', 'S', 'E']
-            idx = dirs.index(self.direction)
-            self.direction = dirs[(idx + 1) % 4]
-        elif action == "turn_right":
-            dirs = ['N', 'E', 'S', 'W']
-            idx = dirs.index(self.direction)
-            self.direction = dirs[(idx + 1) % 4]
+        handler = self._ACTION_HANDLERS.get(action)
+        if handler is not None:
+            handler(self)
+    
+    def _move(self):
+        """Move one cell in the facing direction, staying on the grid"""
+        # Move according to (row, col) convention
+        dx, dy = DIRECTION_VECTORS[self.direction]
+        new_pos = (self.position[0] + dx, self.position[1] + dy)
+        if self._is_valid_pos(new_pos):
+            self.position = new_pos
+    
+    def _turn_left(self):
+        """Rotate 90 degrees counter-clockwise"""
+        self.direction = _TURN_LEFT[self.direction]
+    
+    def _turn_right(self):
+        """Rotate 90 degrees clockwise"""
+        self.direction = _TURN_RIGHT[self.direction]
+    
+    # Action -> handler; IDLE and PICKUP have no effect on the robot itself
+    _ACTION_HANDLERS = {
+        Action.MOVE: _move,
+        Action.TURN_LEFT: _turn_left,
+        Action.TURN_RIGHT: _turn_right,
+    }
     
     def update(self, visible_cells: Dict[Tuple[int, int], int], physical_holding_gold: bool = False):
         """Main update loop: observe, process messages, decide, execute"""
@@ -538,14 +572,31 @@ class Robot:
     
     def _broadcast_my_state(self):
         """Broadcasts essential state to teammates."""
-        state_message = {
-            "type": "state_update",
-            "sender_id": self.id,
-            "broadcast": True,
-            "content": {
+        state_message = Message(
+            type="state_update",
+            sender_id=self.id,
+            broadcast=True,
+            content={
                 "state": self.state,
                 "role": self.role,
                 "position": self.position,
             }
-        }
+        )
         self.message_outbox.append(state_message)
+
+
+def create_group(group: int, count: int, start_id: int, low: int, high: int, grid_size: int = 20,
+                 rng: Optional[np.random.Generator] = None) -> List[Robot]:
+    """Create a group of robots at random positions in the square [low, high] x [low, high]
+
+    Pass a seeded ``np.random.default_rng(seed)`` as ``rng`` for reproducible start poses.
+    """
+    if rng is None:
+        rng = _RNG
+    # Draw every position and facing in one NumPy call instead of per robot
+    positions = rng.integers(low, high + 1, size=(count, 2)).tolist()
+    directions = rng.integers(0, 4, size=count).tolist()
+    return [
+        Robot(start_id + i, group, (x, y), ['N', 'S', 'E', 'W'][d], grid_size)
+        for i, ((x, y), d) in enumerate(zip(positions, directions))
+    ]
@@ -6,11 +6,10 @@ Runs multiple simulations and collects performance metrics for analysis
 
 import sys
 import io
-import random
 import numpy as np
 from contextlib import redirect_stdout
 from grid import Grid
-from robot import Robot
+from robot import create_group
 from simulation import Simulation
 
 def run_single_simulation(num_robots_per_group=10, num_gold=10, max_steps=1000, show_output=False):
@@ -19,30 +18,15 @@ def run_single_simulation(num_robots_per_group=10, num_gold=10, max_steps=1000,
     # Initialize grid
     grid = Grid(size=20, num_gold=num_gold)
     
-    # Initialize robots
-    group1 = []
-    group2 = []
-    
-    for i in range(num_robots_per_group):
-        # Group 1 robots start near top-left
-        x = random.randint(0, 4)
-        y = random.randint(0, 4)
-        direction = random.choice(['N', 'S', 'E', 'W'])
-        robot = Robot(i, 1, (x, y), direction)
-        group1.append(robot)
-        
-        # Group 2 robots start near bottom-right
-        x = random.randint(15, 19)
-        y = random.randint(15, 19)
-        direction = random.choice(['N', 'S', 'E', 'W'])
-        robot = Robot(i + num_robots_per_group, 2, (x, y), direction)
-        group2.append(robot)
+    # Initialize robots: group 1 near top-left, group 2 near bottom-right
+    group1 = create_group(1, num_robots_per_group, start_id=0, low=0, high=4)
+    group2 = create_group(2, num_robots_per_group, start_id=num_robots_per_group, low=15, high=19)
     
     # Redirect stdout to suppress output unless requested
     if not show_output:
         f = io.StringIO()
         with redirect_stdout(f):
-            sim = Simulation(grid, group1, group2, steps=max_steps)
+            sim = Simulation(grid, group1, group2, steps=max_steps, verbose=False)
             sim.run()
     else:
         sim = Simulation(grid, group1, group2, steps=max_steps)
@@ -2,80 +2,145 @@
 Simulation class for running the robot gold collection game
 """
 import random
+import sys
 from collections import defaultdict
 import time
-from utils import strip_ansi
+import numpy as np
+from utils import Action
+
+# ANSI colors used by the grid view
+RED = "\033[31m"
+BLUE = "\033[34m"
+YELLOW = "\033[33m"
+GREEN = "\033[32m"
+RESET = "\033[0m"
+GROUP_COLORS = {1: RED, 2: BLUE}
+
+DIRECTION_SYMBOLS = {'N': '↑', 'S': '↓', 'E': '→', 'W': '←'}
+
+
+def _format_cell(label, color=None):
+    """Center a grid label in a 6-character column, optionally colored"""
+    visible_len = len(label)
+    padding = ' ' * ((6 - visible_len) // 2)
+    text = f'{color}{label}{RESET}' if color else label
+    return padding + text + padding + (' ' if (6 - visible_len) % 2 != 0 else '')
+
+
+EMPTY_CELL = _format_cell('.')
 
 
 class Simulation:
-    def __init__(self, grid, group1, group2, steps=500, message_delay_range=(1, 5)):
+    def __init__(self, grid, group1, group2, steps=500, message_delay_range=(1, 5), verbose=True, step_delay=0.0):
         self.grid = grid
         self.group1 = group1
         self.group2 = group2
         self.steps = steps
+        self.verbose = verbose  # Print the grid, robot details and debug lines every step
+        self.step_delay = step_delay  # Seconds to pause between steps when watching a run
         self.scores = {1: 0, 2: 0}
         self.pickup_counts = {1: 0, 2: 0}
+        self.all_robots = group1 + group2  # Groups are fixed for the whole run
+        self.robots_by_id = {r.id: r for r in self.all_robots}
+        self.robots_by_group = {1: group1, 2: group2}
+        
+        # Deposit positions are fixed per group (see Grid._place_deposits)
+        self.deposit_positions = {1: (0, 0), 2: (grid.size - 1, grid.size - 1)}
         
         # Message delay system
         self.message_delay_range = message_delay_range  # (min_delay, max_delay) in steps
         self.delayed_messages = []  # List of (delivery_step, message)
         self.current_step = 0
         
-        # Maps frozenset of robot IDs to the position where gold was picked up
-        self.physical_gold_carriers = {}  # {frozenset({id1, id2}): pickup_position}
+        # Maps (lower_id, higher_id) robot pairs to the position where gold was picked up
+        self.physical_gold_carriers = {}  # {(id1, id2): pickup_position}
+        
+        # Lines printed during a step, written to stdout in batches by _flush_output
+        self._out = []
+        
+        # Static parts of the grid view, which only depend on the grid size
+        self._grid_legend = "Legend: R1=Group1 (red), R2=Group2 (blue), *=carrying, ↑=N, ↓=S, →=E, ←=W, G=Gold, D1/D2=Deposit"
+        self._grid_header = '    ' + ''.join(f'{j:^7}' for j in range(grid.size))
+        self._grid_footer = '-' * (grid.size * 7)
 
     def run(self):
+        # Bind loop-invariant attributes to locals for the step loop
+        grid = self.grid
+        scores = self.scores
+        pickup_counts = self.pickup_counts
+        step_limit = self.steps
+        num_gold = grid.num_gold
+        all_robots = self.all_robots
+        
         step = 0
-        while step < self.steps:
+        while step < step_limit:
             self.current_step = step
-            print(f"\nStep {step+1}")
-            print("=" * 40)
-            all_robots = self.group1 + self.group2
+            if self.verbose:
+                self._out.append(f"\nStep {step+1}")
+                self._out.append("=" * 40)
 
-            self._process_delayed_messages(all_robots)
+            self._process_delayed_messages()
             self._process_messages(all_robots)
+            
+            # Robots print their own debug lines while updating
+            self._flush_output()
+
+            # Carriers and the grid only change in _execute_actions, so snapshot
+            # them once per step. Converting the grid to nested lists in one call
+            # is much cheaper than indexing the numpy array per sensed cell.
+            carrying_ids = self._physically_carrying_ids()
+            cells = grid.grid.tolist()
 
             for robot in all_robots:
-                # Calculate visible cells outside the robot
+                # Calculate visible cells outside the robot (already within bounds)
                 visible_cells = {}
 
-                for pos in robot.get_visible_positions():
-                    visible_cells[pos] = self.grid.get_cell(pos)
+                for x, y in robot.get_visible_positions():
+                    visible_cells[(x, y)] = cells[x][y]
                 # 2. Tactile Sensing (Current position) - 1 cell
-                visible_cells[robot.position] = self.grid.get_cell(robot.position)
+                x, y = robot.position
+                visible_cells[robot.position] = cells[x][y]
                 
                 # 3. Robot can sense if it's physically carrying gold
-                physical_holding_gold = self._is_robot_physically_carrying(robot.id)
+                physical_holding_gold = robot.id in carrying_ids
                 
                 robot.update(visible_cells, physical_holding_gold)
 
             self._execute_actions(all_robots)
 
-            self._print_grid()
-            
-            states = []
-            for r in all_robots:
-                states.append(f"R{r.id}@{r.position}: {r.state}, role={r.role}, partner={r.carrying_with}, gold={r.holding_gold}, target={r.target_gold_pos}")
-            print(f"Robot details:")
-            for s in states:
-                print(f"  {s}")
-            print(f"Scores - Group 1: {self.scores[1]}, Group 2: {self.scores[2]}")
-            print(f"Pickups - Group 1: {self.pickup_counts[1]}, Group 2: {self.pickup_counts[2]}")
-            print(f"Pending delayed messages: {len(self.delayed_messages)}")
+            if self.verbose:
+                self._print_grid()
+                
+                states = []
+                for r in all_robots:
+                    states.append(f"R{r.id}@{r.position}: {r.state}, role={r.role}, partner={r.carrying_with}, gold={r.holding_gold}, target={r.target_gold_pos}")
+                self._out.append("Robot details:\n  " + "\n  ".join(states))
+                self._out.append(f"Scores - Group 1: {scores[1]}, Group 2: {scores[2]}")
+                self._out.append(f"Pickups - Group 1: {pickup_counts[1]}, Group 2: {pickup_counts[2]}")
+                self._out.append(f"Pending delayed messages: {len(self.delayed_messages)}")
 
             # Check for end condition
-            if self.scores[1] + self.scores[2] >= self.grid.num_gold:
-                print("\nAll gold has been deposited! Ending simulation.")
+            if scores[1] + scores[2] >= num_gold:
+                self._out.append("\nAll gold has been deposited! Ending simulation.")
+                self._flush_output()
                 break
 
-            #if step < self.steps - 1:
-            #    time.sleep(0.05)
+            self._flush_output()
+            
+            if self.step_delay and step < step_limit - 1:
+                time.sleep(self.step_delay)
             
             step += 1
         
         self._print_final_results()
 
-    def _process_delayed_messages(self, all_robots):
+    def _flush_output(self):
+        """Write buffered output lines to stdout in a single call"""
+        if self._out:
+            sys.stdout.write("\n".join(self._out) + "\n")
+            self._out.clear()
+
+    def _process_delayed_messages(self):
         """Deliver messages that have reached their delivery time"""
         messages_to_deliver = []
         remaining_messages = []
@@ -90,92 +155,86 @@ class Simulation:
         
         # Deliver messages that are ready
         for msg in messages_to_deliver:
-            for robot in all_robots:
-                if msg.get("broadcast"):
-                    sender = next((r for r in all_robots if r.id == msg["sender_id"]), None)
-                    if sender and robot.group == sender.group and robot.id != msg["sender_id"]:
-                        robot.message_inbox.append(msg)
-                elif "recipient_id" in msg and robot.id == msg["recipient_id"]:
-                    robot.message_inbox.append(msg)
+            if msg.broadcast:
+                # Broadcasts go to the sender's teammates only
+                sender = self.robots_by_id.get(msg.sender_id)
+                if sender:
+                    for robot in self.robots_by_group[sender.group]:
+                        if robot.id != sender.id:
+                            robot.message_inbox.append(msg)
+            elif msg.recipient_id is not None:
+                recipient = self.robots_by_id.get(msg.recipient_id)
+                if recipient:
+                    recipient.message_inbox.append(msg)
         
-        if messages_to_deliver:
-            print(f"DEBUG: Delivered {len(messages_to_deliver)} delayed messages at step {self.current_step}")
+        if messages_to_deliver and self.verbose:
+            self._out.append(f"DEBUG: Delivered {len(messages_to_deliver)} delayed messages at step {self.current_step}")
     
     def _process_messages(self, all_robots):
         """Collect outgoing messages and add delays"""
-        messages_to_send = []
+        min_delay, max_delay = self.message_delay_range
+        
+        # Schedule each outbox in place, then empty it; no intermediate list
         for robot in all_robots:
-            messages_to_send.extend(robot.message_outbox)
-            robot.message_outbox = []
-
-        for msg in messages_to_send:
-            # Add random delay to message delivery
-            delay = random.randint(self.message_delay_range[0], self.message_delay_range[1])
-            delivery_step = self.current_step + delay
-            self.delayed_messages.append((delivery_step, msg))
+            outbox = robot.message_outbox
+            if not outbox:
+                continue
+            
+            for msg in outbox:
+                # Add random delay to message delivery
+                delay = random.randint(min_delay, max_delay)
+                delivery_step = self.current_step + delay
+                self.delayed_messages.append((delivery_step, msg))
+                
+                # print debug info for finder-helper messages to see delays
+                if self.verbose and msg.type in ["found", "response", "ack", "here", "ack2"]:
+                    self._out.append(f"DEBUG: {msg.type} from R{msg.sender_id} scheduled for step {delivery_step} (delay: {delay})")
             
-            # print debug info for finder-helper messages to see delays
-            if msg["type"] in ["found", "response", "ack", "here", "ack2"]:
-                print(f"DEBUG: {msg['type']} from R{msg['sender_id']} scheduled for step {delivery_step} (delay: {delay})")
+            outbox.clear()
 
     def _execute_actions(self, all_robots):
         """Execute robot actions and handle game mechanics"""
         
-        # Group pickup attempts by position
-        pickup_attempts = defaultdict(lambda: defaultdict(list))
+        # Group pickup attempts by (position, group)
+        pickup_attempts = {}
         actions = {}
         
         for robot in all_robots:
             action = robot.next_action
             actions[robot.id] = action
             
-            if action == "pickup" and not robot.holding_gold:
-                pickup_attempts[robot.position][robot.group].append(robot)
+            if action == Action.PICKUP and not robot.holding_gold:
+                pickup_attempts.setdefault((robot.position, robot.group), []).append(robot)
         
         # Process pickups
-        for pos, groups in pickup_attempts.items():
-            for group, robots_at_pos in groups.items():
-                if len(robots_at_pos) == 2:
-                    gold_available = self.grid.grid[pos]
-                    
-                    # Check if other group also trying
-                    other_group = 3 - group  # 1->2, 2->1
-                    other_trying = len(groups.get(other_group, []))
-                    
-                    if other_trying == 2 and gold_available >= 2:
-                        # Both groups get gold
-                        gold_available = 2
-                    elif other_trying == 2 and gold_available == 1:
-                        # Conflict, both fail
-                        continue
-                    
-                    if gold_available > 0:
-                        # Successful pickup - update physical state only
-                        self.grid.grid[pos] -= 1
-                        self.pickup_counts[group] += 1
-                        
-                        # Track physical gold carriers (physics state)
-                        robot_pair = frozenset({robots_at_pos[0].id, robots_at_pos[1].id})
-                        self.physical_gold_carriers[robot_pair] = pos
-                        
-                        # Robots will sense this via physical_holding_gold in their update()
-                        print(f"DEBUG: Group {group} picked up gold at {pos} (physical)")
+        for pos, group, robots_at_pos in self._resolve_pickups(pickup_attempts):
+            self.pickup_counts[group] += 1
+            
+            # Track physical gold carriers (physics state)
+            id1, id2 = robots_at_pos[0].id, robots_at_pos[1].id
+            robot_pair = (id1, id2) if id1 < id2 else (id2, id1)
+            self.physical_gold_carriers[robot_pair] = pos
+            
+            # Robots will sense this via physical_holding_gold in their update()
+            if self.verbose:
+                self._out.append(f"DEBUG: Group {group} picked up gold at {pos} (physical)")
         
         # Execute movement actions and track all robot positions
         new_positions = {}
         for robot in all_robots:
             old_pos = robot.position
-            if actions[robot.id] not in ["pickup", "idle"]:
-                robot.execute_action(actions[robot.id])
+            action = actions[robot.id]
+            if action >= Action.MOVE:
+                robot.execute_action(action)
             # Track all robots, even if they didn't move
             new_positions[robot.id] = (old_pos, robot.position)
         
-        # Check if carrying pairs physically separated (physics enforcement)
-        pairs_to_drop = []
-        for robot_pair, pickup_pos in list(self.physical_gold_carriers.items()):
-            robot_ids = list(robot_pair)
-            robot1 = next((r for r in all_robots if r.id == robot_ids[0]), None)
-            robot2 = next((r for r in all_robots if r.id == robot_ids[1]), None)
+        # Check carrying pairs for drops and deposits in one pass (physics enforcement)
+        pairs_to_remove = []
+        for robot_pair, pickup_pos in self.physical_gold_carriers.items():
+            id1, id2 = robot_pair
+            robot1 = self.robots_by_id.get(id1)
+            robot2 = self.robots_by_id.get(id2)
             
             # Gold must be dropped if partners are at different positions
             should_drop = False
@@ -196,107 +255,126 @@ class Simulation:
             if should_drop:
                 # Drop gold physically (update grid)
                 self.grid.grid[drop_pos] = 1
-                pairs_to_drop.append(robot_pair)
-                print(f"DEBUG: Gold dropped physically at {drop_pos} - {drop_reason} (R{robot_ids[0]}, R{robot_ids[1]})")
+                pairs_to_remove.append(robot_pair)
+                if self.verbose:
+                    self._out.append(f"DEBUG: Gold dropped physically at {drop_pos} - {drop_reason} (R{id1}, R{id2})")
+                continue
+            
+            # Partners are together, check if they are at their deposit position
+            deposit_pos = self.deposit_positions[robot1.group]
+            if robot1.position == deposit_pos:
+                # Successful deposit Update score and remove physical gold
+                self.scores[robot1.group] += 1
+                pairs_to_remove.append(robot_pair)
+                if self.verbose:
+                    self._out.append(f"DEBUG: Group {robot1.group} scored! Robots {robot1.id} & {robot2.id} (physical)")
         
-        # Remove dropped gold from physical tracking
-        for robot_pair in pairs_to_drop:
+        # Remove dropped and deposited gold from physical tracking
+        for robot_pair in pairs_to_remove:
             del self.physical_gold_carriers[robot_pair]
+
+    def _resolve_pickups(self, pickup_attempts):
+        """Resolve pickup attempts against the gold on the grid.
+        
+        Returns a list of (position, group, robots) for each successful pickup.
+        """
+        gold_grid = self.grid.grid
+        pickups = []
         
-        # Check for deposits (physics enforcement)
-        pairs_to_deposit = []
-        for robot_pair in list(self.physical_gold_carriers.keys()):
-            robot_ids = list(robot_pair)
-            robot1 = next((r for r in all_robots if r.id == robot_ids[0]), None)
-            robot2 = next((r for r in all_robots if r.id == robot_ids[1]), None)
+        for (pos, group), robots_at_pos in pickup_attempts.items():
+            if len(robots_at_pos) != 2:
+                continue
+            
+            gold_available = gold_grid[pos]
+            
+            # Check if other group also trying (1->2, 2->1)
+            other_attempts = pickup_attempts.get((pos, 3 - group))
+            if other_attempts is not None and len(other_attempts) == 2:
+                if gold_available >= 2:
+                    # Both groups get gold
+                    gold_available = 2
+                elif gold_available == 1:
+                    # Conflict, both fail
+                    continue
             
-            if robot1 and robot2:
-                # Check if both robots are at their deposit position
-                deposit_pos = robot1.get_deposit_pos()
-                if robot1.position == deposit_pos and robot2.position == deposit_pos:
-                    # Successful deposit Update score and remove physical gold
-                    self.scores[robot1.group] += 1
-                    pairs_to_deposit.append(robot_pair)
-                    print(f"DEBUG: Group {robot1.group} scored! Robots {robot1.id} & {robot2.id} (physical)")
+            if gold_available > 0:
+                # Successful pickup - update physical state only
+                gold_grid[pos] -= 1
+                pickups.append((pos, group, robots_at_pos))
         
-        # Remove deposited gold from physical tracking
-        for robot_pair in pairs_to_deposit:
-            del self.physical_gold_carriers[robot_pair]
+        return pickups
 
-    def _is_robot_physically_carrying(self, robot_id: int) -> bool:
-        """Check if a robot is physically carrying gold (physics state)"""
+    def _physically_carrying_ids(self) -> set:
+        """Get the ids of all robots physically carrying gold (physics state)"""
+        carrying_ids = set()
         for robot_pair in self.physical_gold_carriers.keys():
-            if robot_id in robot_pair:
-                return True
-        return False
+            carrying_ids.update(robot_pair)
+        return carrying_ids
     
     def _print_grid(self):
         """Print a visual representation of the grid"""
-        print("\nGrid View:")
-        print("Legend: R1=Group1 (red), R2=Group2 (blue), *=carrying, ↑=N, ↓=S, →=E, ←=W, G=Gold, D1/D2=Deposit")
-        print("-" * 50)
-        
-        display_grid = [["." for _ in range(self.grid.size)] for _ in range(self.grid.size)]
+        self._out.append("\nGrid View:")
+        self._out.append(self._grid_legend)
+        self._out.append("-" * 50)
         
-        RED = "\033[31m"
-        BLUE = "\033[34m"
-        YELLOW = "\033[33m"
-        GREEN = "\033[32m"
-        RESET = "\033[0m"
+        # Flat row-major buffer (cell (i, j) at i*size + j); cells are padded as
+        # they are built, so rows are joined without per-cell work
+        size = self.grid.size
+        display_grid = [EMPTY_CELL] * (size * size)
         
-        display_grid[0][0] = 'D1'
-        display_grid[self.grid.size-1][self.grid.size-1] = 'D2'
+        display_grid[0] = _format_cell('D1')
+        display_grid[size*size - 1] = _format_cell('D2')
         
-        for i in range(self.grid.size):
-            for j in range(self.grid.size):
-                if self.grid.grid[i, j] > 0 and (i, j) not in [(0, 0), (self.grid.size-1, self.grid.size-1)]:
-                    display_grid[i][j] = f'{YELLOW}G{int(self.grid.grid[i, j])}{RESET}'
-        
-        all_robots = self.group1 + self.group2
+        # Only visit non-empty cells instead of scanning the whole board
+        deposits = [(0, 0), (size-1, size-1)]
+        for i, j in np.argwhere(self.grid.grid > 0).tolist():
+            if (i, j) not in deposits:
+                display_grid[i*size + j] = _format_cell(f'G{int(self.grid.grid[i, j])}', YELLOW)
         
         # Group robots by position to show overlapping
-        position_map = {}
-        for robot in all_robots:
-            pos = robot.position
-            if pos not in position_map:
-                position_map[pos] = []
-            position_map[pos].append(robot)
+        position_map = defaultdict(list)
+        for robot in self.all_robots:
+            position_map[robot.position].append(robot)
         
         for pos, robots_at_pos in position_map.items():
             x, y = pos
             if len(robots_at_pos) == 1:
                 robot = robots_at_pos[0]
-                direction_symbol = {'N': '↑', 'S': '↓', 'E': '→', 'W': '←'}[robot.direction]
-                color = RED if robot.group == 1 else BLUE
+                direction_symbol = DIRECTION_SYMBOLS[robot.direction]
+                color = GROUP_COLORS[robot.group]
                 
                 if robot.holding_gold:
-                    display_grid[x][y] = f'{color}R{robot.group}{direction_symbol}*{RESET}'
+                    label = f'R{robot.group}{direction_symbol}*'
                 else:
-                    display_grid[x][y] = f'{color}R{robot.group}{direction_symbol}{RESET}'
+                    label = f'R{robot.group}{direction_symbol}'
+                display_grid[x*size + y] = _format_cell(label, color)
             else:
                 # Multiple robots at same position
-                group1_count = sum(1 for r in robots_at_pos if r.group == 1)
-                group2_count = sum(1 for r in robots_at_pos if r.group == 2)
-                carrying = any(r.holding_gold for r in robots_at_pos)
+                # Tally both groups and carrying state in a single pass
+                group1_count = 0
+                group2_count = 0
+                carrying = False
+                for r in robots_at_pos:
+                    if r.group == 1:
+                        group1_count += 1
+                    elif r.group == 2:
+                        group2_count += 1
+                    if r.holding_gold:
+                        carrying = True
                 
                 if group1_count > 0 and group2_count > 0:
-                    display_grid[x][y] = f'{GREEN}MIX{group1_count}{group2_count}{"*" if carrying else ""}{RESET}'
+                    display_grid[x*size + y] = _format_cell(f'MIX{group1_count}{group2_count}{"*" if carrying else ""}', GREEN)
                 elif group1_count > 1:
-                    display_grid[x][y] = f'{RED}R1x{group1_count}{"*" if carrying else ""}{RESET}'
+                    display_grid[x*size + y] = _format_cell(f'R1x{group1_count}{"*" if carrying else ""}', RED)
                 elif group2_count > 1:
-                    display_grid[x][y] = f'{BLUE}R2x{group2_count}{"*" if carrying else ""}{RESET}'
+                    display_grid[x*size + y] = _format_cell(f'R2x{group2_count}{"*" if carrying else ""}', BLUE)
         
-        header = '    ' + ''.join(f'{j:^7}' for j in range(self.grid.size))
-        print(header)
-        for i in range(self.grid.size):
-            row_str = []
-            for cell in display_grid[i]:
-                visible_len = len(strip_ansi(cell))
-                padding = ' ' * ((6 - visible_len) // 2)
-                row_str.append(padding + cell + padding + (' ' if (6 - visible_len) % 2 != 0 else ''))
-            print(f'{i:2d}: {" ".join(row_str)}')
+        lines = [self._grid_header]
+        for i in range(size):
+            lines.append(f'{i:2d}: {" ".join(display_grid[i*size:(i+1)*size])}')
         
-        print('-' * (self.grid.size * 7))
+        lines.append(self._grid_footer)
+        self._out.extend(lines)
 
     def _print_final_results(self):
         print(f"\nFINAL RESULTS:")
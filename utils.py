@@ -2,17 +2,37 @@
 Utility functions and constants for the robot simulation
 """
 import re
-from enum import Enum
+from enum import IntEnum
+from typing import Any, NamedTuple, Optional
+
+
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
 
 
 def strip_ansi(text):
     """Remove ANSI escape codes from text"""
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
+    if '\x1B' not in text:
+        return text
+    return ANSI_ESCAPE.sub('', text)
+
+
+# (row, col) step for each facing: N is up (row-1), S down, E right (col+1), W left
+DIRECTION_VECTORS = {'N': (-1, 0), 'S': (1, 0), 'E': (0, 1), 'W': (0, -1)}
+
+
+class Action(IntEnum):
+    """Actions a robot can take in one step; values from MOVE upward change its pose"""
+    IDLE = 0
+    PICKUP = 1
+    MOVE = 2
+    TURN_LEFT = 3
+    TURN_RIGHT = 4
 
 
-class Direction(Enum):
-    NORTH = (0, -1)
-    SOUTH = (0, 1)
-    EAST = (1, 0)
-    WEST = (-1, 0)
+class Message(NamedTuple):
+    """Protocol message between teammates; content is the per-type payload dict"""
+    type: str
+    sender_id: int
+    content: Any
+    recipient_id: Optional[int] = None
+    broadcast: bool = False